@@ -0,0 +1,143 @@
+import pdfplumber
+import pymupdf
+import re
+import os
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+__all__ = ["extract_page", "extract_rows"]
+
+# Regex patterns
+_AMOUNT_RE = re.compile(r'^-?[\d,]+\.?\d{0,2}$')
+
+# Cells without any digit can't be amounts, so the regex can be skipped
+_DIGITS = frozenset("0123456789")
+
+# Line breaks inside a cell become spaces
+_NL_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
+
+def extract_page(path, page_index):
+    """
+    Extracts the cleaned table rows from a single page of the PDF.
+    Runs in a worker process, so it opens only the page it was given.
+    Uses the largest table PyMuPDF finds, falling back to pdfplumber
+    if that yields no ledger rows.
+    """
+    with pymupdf.open(path) as doc:
+        tables = doc[page_index].find_tables().tables
+        # Largest table, like pdfplumber's extract_table()
+        table = max(tables, key=lambda t: t.row_count * t.col_count).extract() if tables else None
+
+    rows = _clean_table(table)
+
+    if not rows:
+        with pdfplumber.open(path, pages=[page_index + 1]) as pdf:
+            rows = _clean_table(pdf.pages[0].extract_table())
+
+    return rows
+
+def _clean_table(table):
+    """
+    Cleans the cells of an extracted table and keeps only ledger rows
+    (non-empty, not a total, at least 8 columns).
+    """
+    rows = []
+
+    if not table:
+        return rows
+
+    for row in table:
+        # Clean row: remove None and whitespace
+        clean_row = ["" if cell is None else cell.translate(_NL_TABLE).strip() for cell in row]
+        
+        # Skip empty/total rows
+        if not any(clean_row):
+            continue
+        if any("Total" in cell for cell in clean_row):
+            continue
+        
+        # Ensure row has enough columns to apply negative indexing (need at least 8)
+        if len(clean_row) < 8:
+            continue
+
+        rows.append(clean_row)
+
+    return rows
+
+def extract_rows(file_like, progress=None):
+    """
+    Extracts Vehicle, Voucher, Date, and Amount using Relative Column Positioning.
+    Logic: 
+    - Amount is 4th column from the end (Index -4)
+    - Vehicle is 8th column from the end (Index -8)
+    Pages are extracted in parallel and merged in page order.
+    progress, if given, is called with the fraction of pages done.
+    Returns one list per column, ready to wrap in a DataFrame.
+    """
+    cols = {"Vehicle No": [], "Voucher No": [], "Date": [], "Amount (Rs)": []}
+
+    # Write the upload to disk once so worker processes can open it by path
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(file_like.read())
+        path = tmp.name
+
+    try:
+        with pymupdf.open(path) as doc:
+            total_pages = doc.page_count
+
+        page_rows = []
+
+        # No more workers than pages; spawn so the threaded Streamlit server isn't forked
+        workers = max(1, min(os.cpu_count() or 1, total_pages))
+
+        if workers == 1:
+            # A single worker would only add interpreter start-up cost, so run in-process
+            results = (extract_page(path, i) for i in range(total_pages))
+            executor = None
+        else:
+            mp_context = multiprocessing.get_context("spawn")
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context)
+            results = executor.map(extract_page, [path] * total_pages, range(total_pages))
+
+        try:
+            for i, rows in enumerate(results):
+                if progress is not None:
+                    progress((i + 1) / total_pages)
+                page_rows.append(rows)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    finally:
+        os.remove(path)
+
+    for rows in page_rows:
+        for clean_row in rows:
+            # --- 1. EXTRACT AMOUNT (Index -4) ---
+            # Logic: [..., Amount, Freight, Paid, Balance] -> Amount is -4
+            amount_raw = clean_row[-4]
+            
+            # Fallback validation logic similar to previous script
+            if len(amount_raw) < 2 or _DIGITS.isdisjoint(amount_raw) or not _AMOUNT_RE.search(amount_raw):
+                if _AMOUNT_RE.search(clean_row[-5]):
+                    amount_raw = clean_row[-5] 
+                elif _AMOUNT_RE.search(clean_row[-3]):
+                    amount_raw = clean_row[-3] 
+            
+            # --- 2. EXTRACT VEHICLE NO (Index -8) ---
+            # Logic: [Vehicle, Count, Wt, Rate, Amount, Freight, Paid, Balance] -> Vehicle is -8
+            vehicle_raw = clean_row[-8]
+
+            # --- 3. EXTRACT VOUCHER & DATE (First columns) ---
+            voucher_raw = clean_row[0]
+            date_raw = clean_row[1]
+
+            # --- SAVE DATA ---
+            # Every row is kept so dates can be filled down after extraction;
+            # rows without an amount are dropped later by the Amount > 0 filter.
+            cols["Vehicle No"].append(vehicle_raw)
+            cols["Voucher No"].append(voucher_raw)
+            cols["Date"].append(date_raw)
+            cols["Amount (Rs)"].append(amount_raw)
+                    
+    return cols